@@ -0,0 +1,60 @@
+# cython: language_level=3
+"""
+Optional compiled implementation of Markdown table generation.
+
+Produces exactly the same output as pure Python '_py_render_table'
+in markdowngenerator.py, which is used if this extension is not built.
+"""
+from html import escape
+
+from .syntax import MARKDOWN_TABLE_ALIGNMENTS
+
+
+cdef str _fast_escape(str text):
+    if "&" in text or "<" in text or ">" in text or '"' in text or "'" in text:
+        return escape(text)
+    return text
+
+
+cdef str _table_cell(object element, bint html_escape):
+    if isinstance(element, list):
+        return "| " + "".join([f"{list_str}<br> " for list_str in element])
+    if html_escape:
+        return "| " + _fast_escape(str(element)) + " "
+    return f"| {element} "
+
+
+cdef bint _has_list(object row):
+    cdef object element
+    for element in row:
+        if isinstance(element, list):
+            return True
+    return False
+
+
+cpdef str render_table(list headers, list rows, object alignment, bint html_escape):
+    """
+    Generate whole Markdown table: header line, separator and rows.
+
+    Unknown alignment falls back to center.
+    """
+    cdef list table = []
+    cdef str dashes = MARKDOWN_TABLE_ALIGNMENTS.get(
+        alignment, MARKDOWN_TABLE_ALIGNMENTS["center"]
+    )
+    cdef str cells
+    cdef object row
+
+    table.append("".join([f"| {header} " for header in headers]) + "|\n")
+    table.append("|" + dashes * len(headers) + "\n")
+    for row in rows:
+        # Rows without list elements are joined at once
+        if row and not _has_list(row):
+            cells = " | ".join(map(str, row))
+            if html_escape:
+                cells = _fast_escape(cells)
+            table.append("| " + cells + " |\n")
+        else:
+            cells = "".join([_table_cell(element, html_escape) for element in row])
+            table.append(cells + "|\n")
+    return "".join(table)
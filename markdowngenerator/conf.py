@@ -6,6 +6,12 @@ MAX_HEADER_LEVEL = 6
 MIN_HEADER_LEVEL = 1
 TABLE_OF_CONTENT_LINE_POSITION = 7
 
+# Buffer size of the opened document file, in bytes
+WRITE_BUFFER_SIZE = 1 << 20
+# Amount of buffered bytes after which document data is written
+# into the file, when writing is enabled
+FLUSH_THRESHOLD = 1 << 16
+
 
 TMP_HEADER_INFO_PREFIX = "headerinfo"
 TMP_HEADER_INFO_SUFFIX = "json"
@@ -1,9 +1,18 @@
+import codecs
+import io
+import os
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 import logging
 
 linesep = '\n'
+# Forced empty line, in Markdown there should be 2 or more spaces
+EMPTY_LINE = "  " + linesep
 from typing import List
+# html.escape (chained str.replace) is kept over str.translate with a mapping table:
+# translate is faster only for long text without HTML characters, and several
+# times slower for text containing them, because of multi-character replacements.
 from html import escape
 from string import punctuation
 from .syntax import (
@@ -14,6 +23,7 @@ from .syntax import (
     MARKDOWN_MULTILINE_BLOCKQUOTE as MULTILINE_BLOCKQUOTE,
     MARKDOWN_CODE_BLOCK as CODE_BLOCK,
     MARKDOWN_INLINE_CODE_HL as INLINE_CODE_HIGHLIGHT,
+    MARKDOWN_TABLE_ALIGNMENTS as TABLE_ALIGNMENTS,
     FOOTNOTE_IDENTIFIER,
 )
 from .conf import (
@@ -21,9 +31,118 @@ from .conf import (
     MAX_HEADER_LEVEL,
     MIN_HEADER_LEVEL,
     TABLE_OF_CONTENT_LINE_POSITION,
+    WRITE_BUFFER_SIZE,
+    FLUSH_THRESHOLD,
 )
 
+# Encoded once for adding directly into the document data buffer
+EMPTY_LINE_BYTES = EMPTY_LINE.encode()
+
 # from standardizer.markdown.config.log import logger
+_LOGGER = logging.getLogger(__name__)
+
+
+def _is_text_document(document) -> bool:
+    """
+    Check whether document opened by caller expects str instead of bytes.
+
+    Documents which can not be recognized are expected to be in text mode.
+    """
+    if isinstance(document, (io.TextIOBase, codecs.StreamWriter)):
+        return True
+    if isinstance(document, (io.RawIOBase, io.BufferedIOBase)):
+        return False
+    # File wrappers, such as tempfile.NamedTemporaryFile, expose mode of the file
+    return "b" not in getattr(document, "mode", "")
+
+
+def _fast_escape(text: str) -> str:
+    """
+    Escape HTML characters from text.
+
+    Most of the text does not contain any HTML characters,
+    which is checked first to return the text itself without escaping.
+    """
+    if "&" in text or "<" in text or ">" in text or '"' in text or "'" in text:
+        return escape(text)
+    return text
+
+
+@lru_cache(maxsize=64)
+def _table_separator(alignment: str, columns: int) -> str:
+    """
+    Generate line of dashes separating headers of Markdown table.
+
+    Unknown alignment falls back to center.
+    """
+    dashes = TABLE_ALIGNMENTS.get(alignment, TABLE_ALIGNMENTS["center"])
+    return f"|{dashes * columns}{linesep}"
+
+
+def _table_cell(element, html_escape: bool = False) -> str:
+    """
+    Generate single cell of Markdown table, including leading vertical bar.
+
+    If element is list, it is added line by line into single cell.
+    Elements of list are not escaped.
+    """
+    if isinstance(element, list):
+        return "| " + "".join([f"{list_str}<br> " for list_str in element])
+    return f"| {_fast_escape(str(element)) if html_escape else element} "
+
+
+def _table_row(row, html_escape: bool = False) -> str:
+    """
+    Generate single line of Markdown table from row elements, cell by cell.
+    """
+    cells = "".join([_table_cell(element, html_escape) for element in row])
+    return f"{cells}|{linesep}"
+
+
+def _table_rows(rows, html_escape: bool = False) -> List[str]:
+    """
+    Generate lines of Markdown table from rows.
+
+    Escaping is decided once for all rows. Rows without list elements
+    are joined at once, without handling each cell separately.
+    Separators do not contain HTML characters, so whole row can be escaped at once.
+    """
+    if html_escape:
+        return [
+            f"| {_fast_escape(' | '.join(map(str, row)))} |{linesep}"
+            if row and not any(isinstance(element, list) for element in row)
+            else _table_row(row, html_escape)
+            for row in rows
+        ]
+    return [
+        f"| {' | '.join(map(str, row))} |{linesep}"
+        if row and not any(isinstance(element, list) for element in row)
+        else _table_row(row, html_escape)
+        for row in rows
+    ]
+
+
+def _py_render_table(headers: List, rows, alignment: str, html_escape: bool) -> str:
+    """
+    Generate whole Markdown table: header line, separator and rows.
+
+    Pure Python implementation,
+    used if compiled '_tablefast' extension is not available.
+    """
+    header_line = "".join([f"| {header} " for header in headers])
+    return "".join(
+        [
+            f"{header_line}|{linesep}",
+            _table_separator(alignment, len(headers)),
+            *_table_rows(rows, html_escape),
+        ]
+    )
+
+
+try:
+    from ._tablefast import render_table
+except ImportError:
+    render_table = _py_render_table
 
 
 class MarkdownGenerator:
@@ -53,6 +172,7 @@ class MarkdownGenerator:
         document_data_array=None,
         enable_write=False,
         enable_TOC=True,
+        flush_threshold=FLUSH_THRESHOLD,
         logger=None,
     ):
         """
@@ -61,7 +181,7 @@ class MarkdownGenerator:
         GitLab allows following HTML tags as well:
         https://www.rubydoc.info/gems/html-pipeline/1.11.0/HTML/Pipeline/SanitizationFilter#WHITELIST-constant
 
-        :param document: existing opened document file, defaults to None
+        :param document: existing opened document file (text or binary), defaults to None
         :param filename: File to be opened, defaults to None
         :param description: Description of generated document, defaults to None
         :param syntax: Markdown syntax flavor (GitHub vs GitLab)
@@ -69,11 +189,16 @@ class MarkdownGenerator:
         :param tmp_dir: Path of temporal directory. NOTE: not in user, defaults to None
         :param pending_footnote_references, defaults to None
         :param footnote_index
+        :param document_data_array: Shared buffer of document data,
+            bytearray of UTF-8 encoded text, defaults to None.
+            NOTE: Earlier this was list of strings, which raises TypeError now.
+        :param flush_threshold: Amount of buffered bytes after which data is written
+            into the file, when 'enable_write' is True
         """
 
-        self.logger = logger if logger else logging.getLogger()
-        self.logger.name = __name__
-        self.logger.debug("Filename in constructor is {}".format(filename))
+        self.logger = logger if logger else _LOGGER
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Filename in constructor is {}".format(filename))
 
         # Attribute for determining if object is first instance of Markdowngenerator
         # It has has file open, which should be noted on exit.
@@ -82,6 +207,10 @@ class MarkdownGenerator:
         self.description = "Class for generating GitLab flavored Markdown."
 
         self.document = document
+        # Whether document expects str, decided once when document is attached
+        self.document_is_text = (
+            _is_text_document(document) if document is not None else False
+        )
         """
         Attribute for storing everything what is written into the file.
         Makes the manipulation of data in the middle of documenting easier,
@@ -91,45 +220,85 @@ class MarkdownGenerator:
         NOTE: This variable should be shared and passed into every child node
         in constructor, that document structure keeps in correct.
 
-        One index in array is one line in file.
+        Data is stored as UTF-8 encoded bytes into single in-memory buffer (bytearray)
+        instead of list of small strings, and written into the file as it is.
+
+        If 'enable_write' is True, data is written into the file in batches
+        and the buffer is emptied every time 'flush_threshold' is exceeded.
         """
-        self.document_data_array = document_data_array if document_data_array else []
+        if document_data_array is not None and not isinstance(
+            document_data_array, bytearray
+        ):
+            raise TypeError(
+                "document_data_array must be bytearray of UTF-8 encoded text,"
+                f" not {type(document_data_array).__name__}"
+            )
+        self.document_data_array = (
+            document_data_array if document_data_array is not None else bytearray()
+        )
+        # Setting 'enable_write' chooses matching writing methods as well
         self.enable_write = enable_write
         self.enable_TOC = enable_TOC
+        self.flush_threshold = flush_threshold
         ###########
-        if not filename:
+        self.default_filename_on_use = not filename
+        if self.default_filename_on_use:
             self.logger.info(
-                "No file location given. Using default '{}'."
-                " Overwriting existing file.".format(DEFAULT_FILE_LOCATION)
+                "No file location given. Using default '%s'."
+                " Overwriting existing file.",
+                DEFAULT_FILE_LOCATION,
             )
-            self.filename = Path(DEFAULT_FILE_LOCATION).resolve()
-            self.default_filename_on_use = True
-        elif isinstance(filename, Path):
-            self.filename = filename
-            self.default_filename_on_use = False
-        else:
-            self.filename = Path(filename).resolve()
-            self.default_filename_on_use = False
+        self.filename = (
+            filename
+            if isinstance(filename, Path)
+            else Path(filename or DEFAULT_FILE_LOCATION)
+        ).resolve()
         self.syntax = syntax if syntax else "gitlab"
 
         # Index for amount of footnotes and list of actual notes
         # to be written into the end of file
         # We are using dict, so we can pass it by reference among objects
-        self.footnote_index = footnote_index if footnote_index else {"value": 0}
+        self.footnote_index = (
+            footnote_index if footnote_index is not None else {"value": 0}
+        )
         self.pending_footnote_references = (
-            pending_footnote_references if pending_footnote_references else []
+            pending_footnote_references
+            if pending_footnote_references is not None
+            else []
         )
 
         # Trailing details, details section open but not ended if count > 0.
         self.unfinished_details_summary_count = {"value": 0}
 
         # Header information for table of contents
-        self.header_info = header_data_array if header_data_array else []
+        self.header_info = header_data_array if header_data_array is not None else []
         self.header_index = header_index if header_index else 0
 
         # Directory for tmp files, currently not in use.
         self.tmp_dir = tmp_dir
 
+    @property
+    def enable_write(self) -> bool:
+        """
+        Whether data is written into the file in batches during documenting,
+        instead of all at once in the end.
+        """
+        return self._enable_write
+
+    @enable_write.setter
+    def enable_write(self, value: bool):
+        """
+        Choose writing methods when value is set, instead of checking
+        'enable_write' on every call. Methods overridden by subclass are kept in use.
+        """
+        self._enable_write = value
+        if type(self).writeText is MarkdownGenerator.writeText:
+            self.writeText = self._writeTextStream if value else self._writeTextBuffer
+        if type(self).writeTextLine is MarkdownGenerator.writeTextLine:
+            self.writeTextLine = (
+                self._writeTextLineStream if value else self._writeTextLineBuffer
+            )
+
     def __enter__(self):
         """
         Override default enter method to enable
@@ -139,14 +308,15 @@ class MarkdownGenerator:
         """
 
         if self.filename.is_dir():
-            self.filename.mkdir(exist_ok=True)
             self.logger.debug(
                 "Given path is directory without filename, using default filename."
             )
-            self.filename.joinpath(DEFAULT_FILE_LOCATION, ".md")
+            self.filename = self.filename / DEFAULT_FILE_LOCATION
             self.default_filename_on_use = True
         if not self.document:
-            self.document = open(f"{self.filename}", "w+")
+            fd = os.open(self.filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            self.document = os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE)
+            self.document_is_text = False
             current_tmp_dir = tempfile.gettempdir()
             self.tmp_dir = tempfile.TemporaryDirectory(dir=current_tmp_dir)
 
@@ -165,10 +335,29 @@ class MarkdownGenerator:
 
         """
 
-        # Everything will be written at once into the file
-        if not self.enable_write:
-            self.document.writelines(self.document_data_array)
+        # Everything (or the remaining tail, if writing was enabled)
+        # will be written at once into the file
+        self._writeDocumentData()
         self.document.close()
+        # Remove chosen writing methods, bound methods refer back to the instance
+        self.__dict__.pop("writeText", None)
+        self.__dict__.pop("writeTextLine", None)
+
+    def flush(self):
+        """
+        Write buffered document data into the file and empty the buffer.
+
+        Called automatically when 'self.enable_write' is True and amount of
+        buffered bytes exceeds 'self.flush_threshold'.
+        """
+        self._writeDocumentData()
+        self.document_data_array.clear()
+
+    def _writeDocumentData(self):
+        if self.document_is_text:
+            self.document.write(self.document_data_array.decode())
+        else:
+            self.document.write(self.document_data_array)
 
     def writeText(self, text, html_escape: bool = False):
         """
@@ -177,17 +366,25 @@ class MarkdownGenerator:
 
         Text input has been escaped by default from HTML characters which could mess up the document..
 
+        NOTE: Replaced in constructor by implementation matching 'self.enable_write'.
+
         :param text: Input text string
         :param html_escape: bool,  Whether the input should be escaped or not
         """
-        if html_escape:
-            self.document_data_array.append(escape(str(text)))
-            if self.enable_write:
-                self.document.write(escape(str(text)))
-            return
-        self.document_data_array.append(str(text))
         if self.enable_write:
-            self.document.write(str(text))
+            self._writeTextStream(text, html_escape)
+        else:
+            self._writeTextBuffer(text, html_escape)
+
+    def _writeTextBuffer(self, text, html_escape: bool = False):
+        text = _fast_escape(str(text)) if html_escape else str(text)
+        self.document_data_array.extend(text.encode())
+
+    def _writeTextStream(self, text, html_escape: bool = False):
+        text = _fast_escape(str(text)) if html_escape else str(text)
+        self.document_data_array.extend(text.encode())
+        if len(self.document_data_array) > self.flush_threshold:
+            self.flush()
 
     def writeTextLine(self, text=None, html_escape: bool = False):
         """
@@ -200,24 +397,32 @@ class MarkdownGenerator:
 
         Text input has been escaped by default from HTML characters which could mess up the document..
 
+        NOTE: Replaced in constructor by implementation matching 'self.enable_write'.
+
         :param text: Input text string
         :param html_escape: bool, Whether the input should be escaped or not
         """
+        if self.enable_write:
+            self._writeTextLineStream(text, html_escape)
+        else:
+            self._writeTextLineBuffer(text, html_escape)
+
+    def _writeTextLineBuffer(self, text=None, html_escape: bool = False):
         if text is None:
             # Just forcing new line, in Markdown there should be 2 or more spaces as well
-            self.document_data_array.append(str("  ") + linesep)
-            if self.enable_write:
-                self.document.write(str("  ") + linesep)
+            self.document_data_array.extend(EMPTY_LINE_BYTES)
+        else:
+            text = (_fast_escape(str(text)) if html_escape else str(text)) + linesep
+            self.document_data_array.extend(text.encode())
 
-            return
-        if html_escape:
-            self.document_data_array.append(escape(str(text)) + linesep)
-            if self.enable_write:
-                self.document.write(escape(str(text)) + linesep)
-            return
-        self.document_data_array.append(str(text) + linesep)
-        if self.enable_write:
-            self.document.write(str(text) + linesep)
+    def _writeTextLineStream(self, text=None, html_escape: bool = False):
+        if text is None:
+            self.document_data_array.extend(EMPTY_LINE_BYTES)
+        else:
+            text = (_fast_escape(str(text)) if html_escape else str(text)) + linesep
+            self.document_data_array.extend(text.encode())
+        if len(self.document_data_array) > self.flush_threshold:
+            self.flush()
 
     """
     Emphasis, aka italics, bold or strikethrough.
@@ -336,19 +541,16 @@ class MarkdownGenerator:
         """
 
         # Escape backtics/grave accents in attempt to deny codeblock escape
-        grave_accent_escape = "\`"
+        grave_accent_escape = "\\`"
 
-        text = text.replace("`", grave_accent_escape)
+        if "`" in text:
+            text = text.replace("`", grave_accent_escape)
 
-        if escape_html:
-            self.writeTextLine(
-                f"{CODE_BLOCK}{syntax}{linesep}{text}{linesep}{CODE_BLOCK}"
-            )
-        else:
-            self.writeTextLine(
-                f"{CODE_BLOCK}{syntax}{linesep}{text}{linesep}{CODE_BLOCK}",
-                html_escape=False,
-            )
+        # Code is written as separate piece to avoid copying
+        # possibly large input into the new string
+        self.writeText(f"{CODE_BLOCK}{syntax or ''}{linesep}")
+        self.writeText(text, html_escape=escape_html)
+        self.writeTextLine(f"{linesep}{CODE_BLOCK}")
 
     def addInlineCodeBlock(self, text, escape_html: bool = False, write: bool = False):
         """
@@ -386,7 +588,7 @@ class MarkdownGenerator:
         :param text: Input to be written as single line blockquote
         """
         self.writeTextLine(
-            f"{SINGLE_LINE_BLOCKQUOTE}{escape(text.strip())}", html_escape=False
+            f"{SINGLE_LINE_BLOCKQUOTE}{_fast_escape(text.strip())}", html_escape=False
         )
 
     def addMultiLineBlockQuote(self, text):
@@ -402,7 +604,7 @@ class MarkdownGenerator:
         :param text: Input text for inside blockquote
         """
         self.writeTextLine(
-            f"{MULTILINE_BLOCKQUOTE}{linesep}{escape(text.strip())}{linesep}{MULTILINE_BLOCKQUOTE}",
+            f"{MULTILINE_BLOCKQUOTE}{linesep}{_fast_escape(text.strip())}{linesep}{MULTILINE_BLOCKQUOTE}",
             html_escape=False,
         )
 
@@ -467,66 +669,42 @@ class MarkdownGenerator:
                 )
                 return
         try:
-            for header in header_names:
-                # Capitalize header names
-                if capitalize_headers:
-                    self.writeText(f"| {header.capitalize()} ")
-                else:
-                    self.writeText(f"| {header} ")
+            # Capitalize header names
+            if capitalize_headers:
+                headers = [header.capitalize() for header in header_names]
+            else:
+                headers = list(header_names)
         except TypeError as e:
             self.logger.error(f"Invalid header names for table. Not generated: {e}")
             return
-        # Write ending vertical bar
-        self.writeTextLine(f"|")
-
-        # Write dashes to separate headers
-        if alignment == "left":
-            self.writeTextLine("".join(["|", ":---|" * len(header_names)]))
 
-        elif alignment == "center":
-            self.writeTextLine("".join(["|", ":---:|" * len(header_names)]))
-            # self.__exit__()
-            # exit()
-
-        elif alignment == "right":
-            self.writeTextLine("".join(["|", "---:|" * len(header_names)]))
-        else:
+        if not (isinstance(alignment, str) and alignment in TABLE_ALIGNMENTS):
             self.logger.warning("Invalid alignment value in addTable. Using default.")
-            self.writeTextLine("".join(["|", ":---:|" * len(header_names)]))
+            alignment = "center"
 
-        # Write each row into the table
+        # Every row is generated as single line
         if not useDictionaryList:
-
-            for row in row_elements:
-                if len(row) > len(header_names):
-                    self.logger.error(
-                        f"The are more row elements than header names (Row: {len(row)} - Header: {len(header_names)} "
-                    )
-                    continue
-                for element in row:
-                    # Check if element is list
-                    # If it is, add it as by line by line into single cell
-                    if isinstance(element, list):
-                        self.writeText("| ")
-                        for list_str in element:
-                            self.writeText(list_str)
-                            self.writeText("<br> ", html_escape=False)
-                    else:
-                        self.writeText(f"| {element} ", html_escape)
-
-                self.writeTextLine(f"|")
+            rows = (
+                row_elements if isinstance(row_elements, list) else list(row_elements)
+            )
+            columns = len(headers)
+            if any(len(row) > columns for row in rows):
+                valid_rows = []
+                for row in rows:
+                    if len(row) > columns:
+                        self.logger.error(
+                            f"The are more row elements than header names (Row: {len(row)} - Header: {columns} "
+                        )
+                        continue
+                    valid_rows.append(row)
+                rows = valid_rows
 
         else:
             # Iterate over list of dictionaries
             # One row contains attributes of dictionary
-            for row in dictionary_list:
-                for key in row.keys():
-                    if isinstance(row.get(key), list):
-                        self.writeText("| ")
-                        for list_str in row.get(key):
-                            self.writeText(list_str)
-                            self.writeText("<br> ", html_escape=False)
-                    else:
-                        self.writeText(f"| {row.get(key)} ", html_escape)
-                self.writeTextLine(f"|")
+            # Dictionaries keep insertion order, values are used without key lookups
+            rows = [row.values() for row in dictionary_list]
+
+        # Table is generated at once and added to the document
+        self.writeText(render_table(headers, rows, alignment, html_escape))
         self.writeTextLine()
\ No newline at end of file
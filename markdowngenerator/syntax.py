@@ -8,6 +8,8 @@ MARKDOWN_CODE_BLOCK = "```"
 MARKDOWN_SINGLE_LINE_BLOCKQUOTE = ">"
 MARKDOWN_MULTILINE_BLOCKQUOTE = ">>>"  # GitLab only
 MARKDOWN_INLINE_CODE_HL = "`"
+# Dashes separating table headers from rows, per column alignment
+MARKDOWN_TABLE_ALIGNMENTS = {"left": ":---|", "center": ":---:|", "right": "---:|"}
 """
 HTML
 
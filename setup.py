@@ -1,4 +1,18 @@
-from setuptools import setup
+from setuptools import setup, Extension
+
+# Compiled table generation is optional, pure Python implementation is used without it
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [Extension("markdowngenerator._tablefast", ["markdowngenerator/_tablefast.pyx"])],
+        language_level=3,
+    )
+    # Build failure is not fatal either. Set after cythonize, which does not keep it.
+    for extension in ext_modules:
+        extension.optional = True
+except ImportError:
+    ext_modules = []
 
 setup(name='python-markdown-generator',
       version='0.1',
@@ -9,4 +23,5 @@ setup(name='python-markdown-generator',
       author_email='niklas.saari@oulu.fi',
       license='Apache-2.0',
       packages=['markdowngenerator'],
-      zip_safe=False)
\ No newline at end of file
+      ext_modules=ext_modules,
+      zip_safe=False)